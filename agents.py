@@ -1,55 +1,395 @@
 import streamlit as st
+import asyncio
+import collections
+import concurrent.futures
+import concurrent.futures.process
+import functools
+import hashlib
+import inspect
+import json
 import logging
-import time
+import multiprocessing
+import os
 import re
-from crewai import Agent, Task, Crew, Process
-from langchain_openai import ChatOpenAI
-from langchain.tools import Tool
-from langchain.vectorstores import FAISS
-from langchain.embeddings import OpenAIEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.chains import ConversationalRetrievalChain
-from langchain.memory import ConversationBufferMemory
+import threading
+from pathlib import Path
 from urllib.parse import urlparse
-from duckduckgo_search import DDGS
-from newspaper import Article
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import article_cache
+
+# crewai, langchain, faiss, newspaper and duckduckgo_search are imported inside the
+# functions that use them, so loading the app doesn't pay for them up front
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+logging.getLogger("crewai").setLevel(logging.WARNING)
+
+# CrewAI's verbose output is synchronous stdout printing on the hot path; CREW_VERBOSE=1 turns it back on
+VERBOSE = os.getenv("CREW_VERBOSE", "0") == "1"
+
+# Article fetching limits
+FETCH_TIMEOUT = 10
+MAX_FETCH_CONCURRENCY = 5
+
+# Only the first HTML_PREFIX_BYTES of a page are read; the rest (up to HTML_MAX_BYTES)
+# is only read when the prefix yields less than MIN_PREFIX_TEXT chars of article text
+HTML_READ_CHUNK = 8192
+HTML_PREFIX_BYTES = 20_000
+HTML_MAX_BYTES = 2_000_000
+MIN_PREFIX_TEXT = 500
+URL_PATTERN = re.compile(r"https?://[^\s'\",\]\[<>]+")
+
+# RAG chunking and texts per OpenAI embeddings request; past MAX_CHUNKS, adjacent
+# chunks are merged up to MAX_MERGED_CHUNK_LENGTH chars to bound the embedding count
+CHUNK_SIZE = 1500
+CHUNK_OVERLAP = 150
+MAX_CHUNKS = 64
+MAX_MERGED_CHUNK_LENGTH = 3000
+EMBED_BATCH_SIZE = 256
+
+# Break points tried by _fast_split, strongest first
+SPLIT_SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+# HNSW graph parameters for the retrieval index
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_EF_SEARCH = 32
+
+# The HNSW graph stores 8-bit scalar-quantized vectors unless recall@5 against
+# an exact search over a sample of the stored vectors drops below the threshold
+RECALL_SAMPLE_SIZE = 32
+RECALL_THRESHOLD = 0.9
+
+# RAG index cache: small in-process LRU in front of FAISS indexes saved on disk
+RAG_CACHE_DIR = Path("./.rag_cache")
+VECTORSTORE_CACHE_SIZE = 8
+_VECTORSTORE_LOCK = threading.Lock()
+_VECTORSTORE_CACHE = collections.OrderedDict()
+
+# OpenAI clients shared across runs and reruns, keyed by a hash of the API key rather than the key itself;
+# only the most recently used settings are kept
+CLIENT_CACHE_SIZE = 8
+_CLIENT_LOCK = threading.Lock()
+_LLM_CLIENTS = collections.OrderedDict()
+_EMBEDDING_CLIENTS = collections.OrderedDict()
+
+# Run independent task branches as concurrent sub-crews; PARALLEL_CREW=0 falls back to one sequential crew
+PARALLEL_CREW = os.getenv("PARALLEL_CREW", "1") == "1"
+
+
+# Shared OpenAI clients
+def _key_hash(openai_api_key):
+    return hashlib.sha1(openai_api_key.encode()).hexdigest()
+
+def _cached_client(clients, client_key, create):
+    """Return the client stored under client_key, creating it and evicting the least recently used on a miss"""
+    with _CLIENT_LOCK:
+        if client_key in clients:
+            clients.move_to_end(client_key)
+        else:
+            clients[client_key] = create()
+            while len(clients) > CLIENT_CACHE_SIZE:
+                clients.popitem(last=False)
+        return clients[client_key]
+
+def _get_llm(openai_api_key, model, temperature):
+    """Return the shared chat model for these settings, creating it on first use"""
+    from langchain_openai import ChatOpenAI
+    return _cached_client(
+        _LLM_CLIENTS,
+        (model, temperature, _key_hash(openai_api_key)),
+        lambda: ChatOpenAI(api_key=openai_api_key, model=model, temperature=temperature)
+    )
+
+def _get_embeddings(openai_api_key):
+    """Return the shared OpenAI embeddings, behind the on-disk cache"""
+    from langchain.embeddings import OpenAIEmbeddings
+    from embedding_cache import CachedEmbeddings
+    return _cached_client(
+        _EMBEDDING_CLIENTS,
+        _key_hash(openai_api_key),
+        lambda: CachedEmbeddings(OpenAIEmbeddings(api_key=openai_api_key, chunk_size=EMBED_BATCH_SIZE))
+    )
+
+
+# Long-lived DuckDuckGo client so searches reuse one HTTPS session; DDGS isn't thread-safe
+_DDG_LOCK = threading.Lock()
+
+@functools.lru_cache(maxsize=None)
+def _ddg_client():
+    """Create the shared DuckDuckGo client on first use"""
+    from duckduckgo_search import DDGS
+    return DDGS()
 
 
 # Define tools
+@functools.lru_cache(maxsize=256)
+def _search_urls(query):
+    """Run a DuckDuckGo text search; errors propagate so they are never cached"""
+    with _DDG_LOCK:
+        results = list(_ddg_client().text(query, max_results=8))
+    return tuple(result["href"] for result in results if result.get("href"))
+
 def duckduckgo_search(query):
     """Search for articles using DuckDuckGo"""
     try:
-        with DDGS() as ddg:
-            results = list(ddg.text(query, max_results=8))
-        urls = [result["href"] for result in results if result.get("href")]
+        urls = list(_search_urls(query))
         return urls if urls else ["No valid search results found."]
     except Exception as e:
         logger.error(f"Error in DuckDuckGo search: {str(e)}")
         return [f"Error performing search: {str(e)}"]
 
-def fetch_article(url):
-    """Fetch and parse article content"""
+def _article_result(url, content):
+    """Cache usable article text and trim it, or report that there was too little"""
+    if content and len(content) > 50:
+        article_cache.put(url, content)
+        return content[:3000]
+    return f"Insufficient content from {url}"
+
+def _parse_html(url, html):
+    """Extract article text from already downloaded HTML; runs in a worker process"""
+    from newspaper import Article
+    article = Article(url)
+    article.set_html(html)
+    article.parse()
+    return article.text
+
+@functools.lru_cache(maxsize=None)
+def _parse_pool():
+    """Process pool for CPU-bound article parsing, created on first use"""
+    # Workers must not fork the multi-threaded server process, so start them from a clean interpreter
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context(start_method)
+    )
+
+_PARSE_POOL_LOCK = threading.Lock()
+
+async def _parse_in_pool(url, html):
+    """Parse HTML in the process pool, replacing the pool once if a dead worker has broken it"""
+    loop = asyncio.get_running_loop()
+    pool = _parse_pool()
     try:
-        parsed_url = urlparse(url)
-        if not parsed_url.scheme or not parsed_url.netloc:
-            return f"Invalid URL format: {url}"
-        article = Article(url, timeout=10)
-        article.download()
-        article.parse()
-        content = article.text
-        return content[:3000] if content and len(content) > 50 else f"Insufficient content from {url}"
+        return await loop.run_in_executor(pool, _parse_html, url, html)
+    except concurrent.futures.process.BrokenProcessPool:
+        logger.warning(f"Article parser pool broke while parsing {url}, restarting it")
+        with _PARSE_POOL_LOCK:
+            # Concurrent parses see the same broken pool; only the first one replaces it
+            if _parse_pool() is pool:
+                _parse_pool.cache_clear()
+                pool.shutdown(wait=False)
+        return await loop.run_in_executor(_parse_pool(), _parse_html, url, html)
+
+async def _fetch_one(session, url):
+    """Download a single article with a shared HTTP session"""
+    parsed_url = urlparse(url)
+    if not parsed_url.scheme or not parsed_url.netloc:
+        return f"Invalid URL format: {url}"
+    cached = article_cache.get(url)
+    if cached is not None:
+        return cached
+    
+    async def read_until(response, buf, limit):
+        async for chunk in response.content.iter_chunked(HTML_READ_CHUNK):
+            buf.extend(chunk)
+            if len(buf) >= limit:
+                return False
+        return True
+    
+    async def parse(buf, encoding):
+        # Parsing holds the GIL, so it runs in another process while other downloads continue
+        html = buf.decode(encoding, errors="ignore")
+        return await _parse_in_pool(url, html)
+    
+    async with session.get(url) as response:
+        response.raise_for_status()
+        encoding = response.charset or "utf-8"
+        buf = bytearray()
+        complete = await read_until(response, buf, HTML_PREFIX_BYTES)
+        content = await parse(buf, encoding)
+        if not complete and len(content or "") < MIN_PREFIX_TEXT:
+            # The article body wasn't in the prefix, so keep reading the same response
+            await read_until(response, buf, HTML_MAX_BYTES)
+            content = await parse(buf, encoding)
+    return _article_result(url, content)
+
+async def fetch_articles_async(urls, max_concurrency=MAX_FETCH_CONCURRENCY):
+    """Fetch several articles concurrently, at most max_concurrency at a time"""
+    import aiohttp
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded_fetch(session, url):
+        async with semaphore:
+            return await _fetch_one(session, url)
+
+    timeout = aiohttp.ClientTimeout(total=FETCH_TIMEOUT)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        results = await asyncio.gather(
+            *(bounded_fetch(session, url) for url in urls),
+            return_exceptions=True
+        )
+
+    articles = []
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error fetching article from {url}: {str(result)}")
+            result = f"Error fetching content from {url}: {str(result)}"
+        articles.append((url, result))
+    return articles
+
+def duckduckgo_search_with_content(query):
+    """Search DuckDuckGo and return each result URL with its article text"""
+    try:
+        urls = list(_search_urls(query))
     except Exception as e:
-        logger.error(f"Error fetching article from {url}: {str(e)}")
-        return f"Error fetching content from {url}: {str(e)}"
+        logger.error(f"Error in DuckDuckGo search: {str(e)}")
+        return f"Error performing search: {str(e)}"
+    if not urls:
+        return "No valid search results found."
+    articles = asyncio.run(fetch_articles_async(urls))
+    return json.dumps([{"url": url, "snippet": content} for url, content in articles])
+
+def fetch_articles(urls):
+    """Fetch and parse a batch of articles in one call"""
+    # Agents pass tool input as text, so pull the URLs out of whatever list format they used
+    if isinstance(urls, str):
+        urls = URL_PATTERN.findall(urls)
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return "No valid URLs provided."
+    articles = asyncio.run(fetch_articles_async(urls))
+    return "\n\n".join(f"Source: {url}\n{content}" for url, content in articles)
+
+
+# Build the FAISS index for a report
+def _fast_split(content, chunk_size, chunk_overlap):
+    """Greedy splitter that finds break points with str.rfind instead of walking the text in Python"""
+    chunks = []
+    start = 0
+    length = len(content)
+    while start < length:
+        end = min(start + chunk_size, length)
+        if end < length:
+            # Break after the strongest separator in the back half of the window
+            for separator in SPLIT_SEPARATORS:
+                cut = content.rfind(separator, start + chunk_size // 2, end)
+                if cut != -1:
+                    end = cut + len(separator)
+                    break
+        chunk = content[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= length:
+            break
+        # Step back by the overlap, then forward to the next word so chunks don't start mid-word
+        overlap_start = max(end - chunk_overlap, start + 1)
+        space = content.find(" ", overlap_start, end)
+        start = space + 1 if space != -1 else overlap_start
+    return chunks
+
+def _merge_chunks(chunks, max_length):
+    """Greedily merge neighbouring chunks while the result stays within max_length"""
+    merged = []
+    for chunk in chunks:
+        if merged and len(merged[-1]) + 1 + len(chunk) <= max_length:
+            merged[-1] = f"{merged[-1]}\n{chunk}"
+        else:
+            merged.append(chunk)
+    return merged
+
+def split_report(content):
+    """Split report text into RAG chunks"""
+    # One splitter for every length, so chunks pre-embedded from a streamed prefix match the final split
+    chunks = _fast_split(content, CHUNK_SIZE, CHUNK_OVERLAP)
+    
+    if len(chunks) > MAX_CHUNKS:
+        chunks = _merge_chunks(chunks, MAX_MERGED_CHUNK_LENGTH)
+    return chunks
+
+def _build_vectorstore(content, embeddings):
+    """Split content into chunks and index them"""
+    import faiss
+    import numpy as np
+    from langchain.vectorstores import FAISS
+    # Create chunks and vectorize in explicit batches
+    chunks = split_report(content)
+    vectors = []
+    for i in range(0, len(chunks), EMBED_BATCH_SIZE):
+        vectors.extend(embeddings.embed_documents(chunks[i:i + EMBED_BATCH_SIZE]))
+    vectorstore = FAISS.from_embeddings(list(zip(chunks, vectors)), embeddings)
+    
+    # Swap the default flat L2 index for an HNSW graph over the same vectors, in the same order
+    flat_index = vectorstore.index
+    all_vectors = flat_index.reconstruct_n(0, flat_index.ntotal)
+    
+    hnsw_index = faiss.IndexHNSWSQ(flat_index.d, faiss.ScalarQuantizer.QT_8bit, HNSW_M)
+    hnsw_index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    hnsw_index.train(all_vectors)
+    hnsw_index.add(all_vectors)
+    hnsw_index.hnsw.efSearch = HNSW_EF_SEARCH
+    
+    # Check the quantized graph still finds what an exact search finds
+    k = min(5, flat_index.ntotal)
+    sample = all_vectors[:RECALL_SAMPLE_SIZE]
+    if k and len(sample):
+        _, exact_ids = flat_index.search(sample, k)
+        _, approx_ids = hnsw_index.search(sample, k)
+        recall = np.mean([len(set(exact) & set(approx)) / k for exact, approx in zip(exact_ids, approx_ids)])
+        if recall < RECALL_THRESHOLD:
+            logger.info(f"Int8 index recall@{k} was {recall:.2f}, falling back to full-precision vectors")
+            hnsw_index = faiss.IndexHNSWFlat(flat_index.d, HNSW_M)
+            hnsw_index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            hnsw_index.add(all_vectors)
+            hnsw_index.hnsw.efSearch = HNSW_EF_SEARCH
+    
+    vectorstore.index = hnsw_index
+    return vectorstore
+
+def _get_vectorstore(content_key, content, embeddings, openai_api_key):
+    """Load the index for this content from memory or disk, building it on a miss"""
+    from langchain.vectorstores import FAISS
+    # The index keeps a handle to the embedder, so in-process entries are per API key
+    memory_key = (_key_hash(openai_api_key), content_key)
+    with _VECTORSTORE_LOCK:
+        if memory_key in _VECTORSTORE_CACHE:
+            _VECTORSTORE_CACHE.move_to_end(memory_key)
+            return _VECTORSTORE_CACHE[memory_key]
+    
+    path = RAG_CACHE_DIR / content_key
+    vectorstore = None
+    if path.exists():
+        try:
+            # Older langchain-community releases (like the pinned one) forward unknown kwargs to FAISS.__init__
+            load_kwargs = {}
+            if "allow_dangerous_deserialization" in inspect.signature(FAISS.load_local).parameters:
+                load_kwargs["allow_dangerous_deserialization"] = True
+            vectorstore = FAISS.load_local(str(path), embeddings, **load_kwargs)
+            logger.info(f"Loaded RAG index {content_key} from disk")
+        except Exception as e:
+            logger.error(f"Error loading cached RAG index {content_key}: {str(e)}")
+    
+    if vectorstore is None:
+        vectorstore = _build_vectorstore(content, embeddings)
+        try:
+            vectorstore.save_local(str(path))
+        except Exception as e:
+            logger.error(f"Error saving RAG index {content_key}: {str(e)}")
+    
+    with _VECTORSTORE_LOCK:
+        _VECTORSTORE_CACHE[memory_key] = vectorstore
+        # Older indexes stay on disk, so evicting them only costs a reload
+        while len(_VECTORSTORE_CACHE) > VECTORSTORE_CACHE_SIZE:
+            _VECTORSTORE_CACHE.popitem(last=False)
+    return vectorstore
 
 
 # Setup RAG system
 def setup_rag_system(content, openai_api_key, model, temperature, topic):
     """Setup RAG system for interactive Q&A"""
+    from langchain.chains import ConversationalRetrievalChain
+    from langchain.memory import ConversationBufferMemory
     try:
         # Ensure content is string
         if not isinstance(content, str):
@@ -59,32 +399,32 @@ def setup_rag_system(content, openai_api_key, model, temperature, topic):
                 content = str(content.output)
             else:
                 content = str(content)
-                
-        # Initialize embeddings
-        embeddings = OpenAIEmbeddings(api_key=openai_api_key)
         
-        # Split text into chunks
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len
-        )
+        content_hash = hashlib.sha256(content.encode()).hexdigest()
         
-        # Create chunks and vectorize
-        chunks = text_splitter.split_text(content)
-        vectorstore = FAISS.from_texts(chunks, embeddings)
+        # Nothing to rebuild if this topic is already indexed for the same content
+        indexed = st.session_state.vectorstore.get(topic)
+        if indexed and indexed[0] == content_hash:
+            return indexed[2]
+        
+        content_key = content_hash[:16]
+                
+        # Initialize embeddings behind the on-disk cache
+        embeddings = _get_embeddings(openai_api_key)
+        
+        vectorstore = _get_vectorstore(content_key, content, embeddings, openai_api_key)
         
         # Initialize memory and QA chain
         memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
         
         qa_chain = ConversationalRetrievalChain.from_llm(
-            llm=ChatOpenAI(api_key=openai_api_key, model=model, temperature=temperature),
+            llm=_get_llm(openai_api_key, model, temperature),
             retriever=vectorstore.as_retriever(search_kwargs={"k": 5}),
             memory=memory
         )
         
         # Store in session state
-        st.session_state.vectorstore[topic] = vectorstore
+        st.session_state.vectorstore[topic] = (content_hash, vectorstore, qa_chain)
         st.session_state.qa_chain[topic] = qa_chain
         
         if topic not in st.session_state.chat_history:
@@ -97,9 +437,32 @@ def setup_rag_system(content, openai_api_key, model, temperature, topic):
         st.error(f"Error setting up RAG system: {str(e)}")
         return None
 
+# Concurrent crew execution
+async def _kickoff_async(crew):
+    """Kick off a crew without blocking the event loop"""
+    if hasattr(crew, "kickoff_async"):
+        return await crew.kickoff_async()
+    return await asyncio.to_thread(crew.kickoff)
+
+async def _run_crews_in_parallel(market_crew, competitor_crew, strategy_crew, report_crew):
+    """Run market research first, then the competitor and strategy branches side by side, then the report"""
+    await _kickoff_async(market_crew)
+    await asyncio.gather(_kickoff_async(competitor_crew), _kickoff_async(strategy_crew))
+    return await _kickoff_async(report_crew)
+
+
+def _log_step(step):
+    """Agent step trace, visible with debug logging even when verbose output is off"""
+    logger.debug(f"Agent step: {step}")
+
+
 # Run analysis with CrewAI
-def run_analysis(topic, openai_api_key, model, temperature, articles_count):
+def run_analysis(topic, openai_api_key, model, temperature, articles_count, verbose=VERBOSE):
     """Run comprehensive analysis with CrewAI"""
+    from crewai import Agent, Task, Crew, Process
+    from langchain.tools import Tool
+    from report_stream import StreamingEmbedder
+    
     # Initialize progress tracking
     progress_bar = st.progress(0)
     status_text = st.empty()
@@ -107,16 +470,36 @@ def run_analysis(topic, openai_api_key, model, temperature, articles_count):
     def update_status(message, progress):
         status_text.info(message)
         progress_bar.progress(progress)
-        time.sleep(0.2)
+    
+    # Progress advances as tasks actually complete; the label counts tasks rather than naming one,
+    # because in parallel mode two branches run at once and finish in either order
+    task_count = 5
+    completed_tasks = []
+    progress_lock = threading.Lock()
+    script_ctx = get_script_run_ctx()
+    
+    def on_task_complete(output):
+        # Parallel sub-crews finish tasks on worker threads, which need the script context to draw
+        add_script_run_ctx(threading.current_thread(), script_ctx)
+        with progress_lock:
+            completed_tasks.append(output)
+            done = len(completed_tasks)
+            if done < task_count:
+                update_status(f"Running expert analysis: {done}/{task_count} tasks complete...", 40 + int(55 * done / task_count))
+            # Everything but the final report is done, so start embedding the report as it streams
+            if done == task_count - 1:
+                report_embedder.start()
     
     update_status("Initializing analysis pipeline...", 5)
     
+    # Pre-embeds the final report while it is generated, so RAG setup mostly hits the embedding cache
+    report_embedder = StreamingEmbedder(_get_embeddings(openai_api_key), split_report, CHUNK_SIZE)
+    
     try:
-        # Initialize LLM
-        llm = ChatOpenAI(
-            api_key=openai_api_key,
-            model=model,
-            temperature=temperature
+        # Initialize LLM: a shallow copy of the shared client keeps its connection pool
+        # but gets this run's callbacks, which CrewAI also appends its token counter to
+        llm = _get_llm(openai_api_key, model, temperature).copy(
+            update={"streaming": True, "callbacks": [report_embedder]}
         )
         
         # Tools setup
@@ -126,31 +509,42 @@ def run_analysis(topic, openai_api_key, model, temperature, articles_count):
             description="Perform DuckDuckGo searches and retrieve top URLs."
         )
         
-        fetch_tool = Tool(
-            name="FetchArticle",
-            func=fetch_article,
-            description="Fetch article text from URLs with robust error handling."
+        research_tool = Tool(
+            name="SearchWithContent",
+            func=duckduckgo_search_with_content,
+            description="Search DuckDuckGo and return the top result URLs together with their article text, ready to cite."
+        )
+        
+        batch_fetch_tool = Tool(
+            name="FetchArticlesBatch",
+            func=fetch_articles,
+            description="Fetch article text for a whole list of URLs concurrently in a single call."
         )
         
         update_status("Creating specialized research agents...", 15)
         
-        # Create specialized agents
+        # Create specialized agents; delegation is off because single-agent sub-crews in parallel
+        # mode get no delegation tools, and both modes should behave the same
         market_researcher = Agent(
             role="Market Research Specialist",
             goal=f"Find comprehensive market data about {topic} including size, growth, trends",
             backstory="Expert at analyzing market dynamics and extracting valuable insights.",
-            tools=[search_tool, fetch_tool],
+            tools=[research_tool, batch_fetch_tool],
             llm=llm,
-            verbose=True
+            allow_delegation=False,
+            verbose=verbose,
+            step_callback=_log_step
         )
         
         competitor_analyst = Agent(
             role="Competitive Intelligence Expert",
             goal=f"Identify key competitors in the {topic} space and analyze their strategies",
             backstory="Specialist in competitive analysis with deep industry knowledge.",
-            tools=[search_tool, fetch_tool],
+            tools=[research_tool, batch_fetch_tool],
             llm=llm,
-            verbose=True
+            allow_delegation=False,
+            verbose=verbose,
+            step_callback=_log_step
         )
         
         business_strategist = Agent(
@@ -159,7 +553,9 @@ def run_analysis(topic, openai_api_key, model, temperature, articles_count):
             backstory="Experienced business consultant who has helped numerous startups succeed.",
             tools=[search_tool],
             llm=llm,
-            verbose=True
+            allow_delegation=False,
+            verbose=verbose,
+            step_callback=_log_step
         )
         
         financial_analyst = Agent(
@@ -167,7 +563,9 @@ def run_analysis(topic, openai_api_key, model, temperature, articles_count):
             goal=f"Provide financial insights for a {topic} startup",
             backstory="Expert in startup financial modeling with experience in venture funding.",
             llm=llm,
-            verbose=True
+            allow_delegation=False,
+            verbose=verbose,
+            step_callback=_log_step
         )
         
         update_status("Setting up specialized research tasks...", 25)
@@ -184,6 +582,8 @@ def run_analysis(topic, openai_api_key, model, temperature, articles_count):
             6. Challenges and barriers
             
             Use specific data points, statistics, and cite sources when possible.
+            Use SearchWithContent, which returns article text with each result URL, and cite
+            those sources directly instead of fetching articles one at a time.
             """,
             agent=market_researcher,
             expected_output="Comprehensive market analysis with specific data points"
@@ -199,6 +599,8 @@ def run_analysis(topic, openai_api_key, model, temperature, articles_count):
             5. Identify potential gaps in the market
             
             Focus on both established players and innovative startups.
+            Use SearchWithContent, which returns article text with each result URL, and cite
+            those sources directly instead of fetching articles one at a time.
             """,
             agent=competitor_analyst,
             context=[market_research_task],
@@ -214,10 +616,11 @@ def run_analysis(topic, openai_api_key, model, temperature, articles_count):
             4. Outline go-to-market strategy
             5. Propose partnership opportunities
             
-            Base recommendations on market research and competitor analysis.
+            Base recommendations on the market research and any competitor analysis available.
             """,
             agent=business_strategist,
-            context=[market_research_task, competitor_analysis_task],
+            # In parallel mode strategy runs alongside competitor analysis, so it can only build on market research
+            context=[market_research_task] if PARALLEL_CREW else [market_research_task, competitor_analysis_task],
             expected_output="Comprehensive business strategy recommendations"
         )
         
@@ -278,26 +681,53 @@ def run_analysis(topic, openai_api_key, model, temperature, articles_count):
         
         update_status("Assembling expert crew and initializing analysis...", 35)
         
-        # Create and run the crew
-        crew = Crew(
-            agents=[market_researcher, competitor_analyst, business_strategist, financial_analyst],
-            tasks=[market_research_task, competitor_analysis_task, business_strategy_task, financial_insights_task, final_report_task],
-            verbose=True,
-            process=Process.sequential
-        )
-        
-        update_status("Conducting in-depth market research...", 45)
-        time.sleep(1)
-        update_status("Analyzing competitor landscape...", 55)
-        time.sleep(1)
-        update_status("Developing business strategy recommendations...", 65)
-        time.sleep(1)
-        update_status("Compiling financial insights...", 75)
-        time.sleep(1)
-        update_status("Generating comprehensive report...", 85)
+        update_status(f"Running expert analysis: 0/{task_count} tasks complete...", 40)
         
-        # Run analysis
-        result = crew.kickoff()
+        # Create and run the crew; progress comes from the crew-level task_callback, since CrewAI 0.28
+        # overwrites each task's own callback with it on kickoff
+        if PARALLEL_CREW:
+            market_crew = Crew(
+                agents=[market_researcher],
+                tasks=[market_research_task],
+                verbose=verbose,
+                process=Process.sequential,
+                task_callback=on_task_complete
+            )
+            competitor_crew = Crew(
+                agents=[competitor_analyst],
+                tasks=[competitor_analysis_task],
+                verbose=verbose,
+                process=Process.sequential,
+                task_callback=on_task_complete
+            )
+            strategy_crew = Crew(
+                agents=[business_strategist, financial_analyst],
+                tasks=[business_strategy_task, financial_insights_task],
+                verbose=verbose,
+                process=Process.sequential,
+                task_callback=on_task_complete
+            )
+            report_crew = Crew(
+                agents=[business_strategist],
+                tasks=[final_report_task],
+                verbose=verbose,
+                process=Process.sequential,
+                task_callback=on_task_complete
+            )
+            
+            # Run analysis
+            result = asyncio.run(_run_crews_in_parallel(market_crew, competitor_crew, strategy_crew, report_crew))
+        else:
+            crew = Crew(
+                agents=[market_researcher, competitor_analyst, business_strategist, financial_analyst],
+                tasks=[market_research_task, competitor_analysis_task, business_strategy_task, financial_insights_task, final_report_task],
+                verbose=verbose,
+                process=Process.sequential,
+                task_callback=on_task_complete
+            )
+            
+            # Run analysis
+            result = crew.kickoff()
         
         # Convert result to string
         if hasattr(result, 'raw'):
@@ -315,5 +745,8 @@ def run_analysis(topic, openai_api_key, model, temperature, articles_count):
         logger.error(f"Error during analysis: {str(e)}")
         st.error(f"An error occurred during analysis: {str(e)}")
         return None
+    
+    finally:
+        report_embedder.finish()
 
 
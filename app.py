@@ -3,8 +3,9 @@ import streamlit as st
 import os
 import logging
 import json
+import re
 import time
-from agents import run_analysis, setup_rag_system
+from agents import run_analysis, setup_rag_system, VERBOSE
 from ui import (setup_page, load_css, display_analysis_dashboard, 
                display_qa_interface, generate_visualizations, extract_insights)
 
@@ -12,6 +13,10 @@ from ui import (setup_page, load_css, display_analysis_dashboard,
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Risk vocabulary highlighted in answers to risk questions
+_RISK_RE = re.compile(r"\b(risks?|challenges?|uncertaint(?:y|ies)|threats?|concerns?)\b", re.IGNORECASE)
+_RISK_SPAN = "<span style='color: #e53935; font-weight: bold;'>\\1</span>"
+
 # Session state initialization
 def init_session_state():
     if 'saved_analyses' not in st.session_state:
@@ -44,17 +49,18 @@ def ask_question(question, topic):
             # Highlight key terms in the response for better visibility
             answer = result.get("answer", "I couldn't find specific information about that in the analysis.")
             
-            # If it's a financial risks question, ensure visibility with formatting
-            if "financial risk" in question.lower() or "risks" in question.lower():
-                risks_terms = ["risk", "challenge", "uncertainty", "threat", "concern"]
-                for term in risks_terms:
-                    answer = answer.replace(term, f"<span style='color: #e53935; font-weight: bold;'>{term}</span>")
+            # If it's a risks question, ensure visibility with formatting in a single pass
+            if _RISK_RE.search(question):
+                answer = _RISK_RE.sub(_RISK_SPAN, answer)
             
             # Add answer to history
             st.session_state.chat_history[topic].append({"role": "assistant", "content": answer})
             
-            # Rerun to update the UI
-            st.experimental_rerun()
+            # Render the new turn in place rather than rerunning the whole script
+            with st.chat_message("user"):
+                st.markdown(question)
+            with st.chat_message("assistant"):
+                st.markdown(answer, unsafe_allow_html=True)
             
         except Exception as e:
             logger.error(f"Error getting answer: {str(e)}")
@@ -115,6 +121,13 @@ def main():
             help="Allow asking questions about the analysis"
         )
         
+        # Developer toggle for CrewAI's per-step console output
+        verbose_logs = st.checkbox(
+            "Verbose agent logs", 
+            value=VERBOSE,
+            help="Print every agent step to the console; slows analysis down"
+        )
+        
         # Previous analyses
         if st.session_state.saved_analyses:
             st.header("Saved Analyses")
@@ -175,7 +188,7 @@ def main():
             os.environ["OPENAI_API_KEY"] = openai_api_key
             
             # Run analysis
-            analysis_result = run_analysis(topic, openai_api_key, selected_model, temperature, articles_count)
+            analysis_result = run_analysis(topic, openai_api_key, selected_model, temperature, articles_count, verbose=verbose_logs)
             
             if analysis_result:
                 # Store result
@@ -0,0 +1,48 @@
+import hashlib
+import functools
+import logging
+from datetime import date
+import diskcache
+
+logger = logging.getLogger(__name__)
+
+# Cache settings
+CACHE_DIR = "./.article_cache"
+CACHE_TTL = 86400
+MAX_CONTENT_LENGTH = 3000
+
+_disk_cache = diskcache.Cache(CACHE_DIR)
+stats = {"hits": 0, "misses": 0}
+
+
+def cache_key(url):
+    """Content-address a URL, salted with today's date so entries roll over daily"""
+    salted = f"{date.today().isoformat()}|{url}"
+    return hashlib.blake2b(salted.encode(), digest_size=32).hexdigest()
+
+@functools.lru_cache(maxsize=512)
+def _memory_get(key):
+    """In-process layer in front of the disk cache; misses raise so they are never memoized"""
+    content = _disk_cache.get(key)
+    if content is None:
+        raise KeyError(key)
+    return content
+
+def get(url):
+    """Return cached article text for a URL, or None on a miss"""
+    try:
+        content = _memory_get(cache_key(url))
+    except KeyError:
+        stats["misses"] += 1
+        logger.info(f"Article cache miss for {url} (hits={stats['hits']}, misses={stats['misses']})")
+        return None
+    stats["hits"] += 1
+    logger.info(f"Article cache hit for {url} (hits={stats['hits']}, misses={stats['misses']})")
+    return content
+
+def put(url, content):
+    """Store parsed article text for a URL"""
+    try:
+        _disk_cache.set(cache_key(url), content[:MAX_CONTENT_LENGTH], expire=CACHE_TTL)
+    except Exception as e:
+        logger.error(f"Error writing article cache for {url}: {str(e)}")
@@ -0,0 +1,84 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+# Cache settings
+CACHE_PATH = "./.embed_cache.sqlite"
+SQLITE_MAX_PARAMS = 500
+
+
+
+def quantize(vector):
+    """Scale a vector into int8, returning (scale, bytes)"""
+    vector = np.asarray(vector, dtype=np.float32)
+    max_abs = float(np.abs(vector).max()) if vector.size else 0.0
+    scale = max_abs / 127 if max_abs > 0 else 1.0
+    return scale, np.round(vector / scale).astype(np.int8).tobytes()
+
+def dequantize(blob, scale):
+    """Rebuild a float vector from its int8 bytes and scale"""
+    return (np.frombuffer(blob, dtype=np.int8).astype(np.float32) * scale).tolist()
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings adapter that only sends uncached texts to the wrapped embedder"""
+
+    def __init__(self, embeddings, path=CACHE_PATH):
+        self.embeddings = embeddings
+        self.model_name = getattr(embeddings, "model", type(embeddings).__name__)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings_q8 (key TEXT PRIMARY KEY, scale REAL, vector BLOB)")
+
+    def _key(self, text):
+        return hashlib.sha256(f"{self.model_name}|{text}".encode()).hexdigest()
+
+    def _lookup(self, keys):
+        """Load cached vectors for the given keys"""
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), SQLITE_MAX_PARAMS):
+                batch = keys[i:i + SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, scale, vector FROM embeddings_q8 WHERE key IN ({placeholders})", batch
+                )
+                for key, scale, blob in rows:
+                    found[key] = dequantize(blob, scale)
+        return found
+
+    def _store(self, items):
+        """Persist (key, vector) pairs as int8"""
+        rows = [(key, *quantize(vector)) for key, vector in items]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings_q8 (key, scale, vector) VALUES (?, ?, ?)", rows)
+
+    def embed_documents(self, texts):
+        """Embed texts, reusing cached vectors and embedding only the misses"""
+        keys = [self._key(text) for text in texts]
+        vectors = self._lookup(list(set(keys)))
+
+        # Identical texts share a key, so each miss is only embedded once
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        hits = sum(1 for key in keys if key not in missing)
+        logger.info(f"Embedding cache: {hits} hits, {len(keys) - hits} misses")
+        if missing:
+            new_vectors = self.embeddings.embed_documents(list(missing.values()))
+            new_items = list(zip(missing.keys(), new_vectors))
+            try:
+                self._store(new_items)
+            except Exception as e:
+                logger.error(f"Error writing embedding cache: {str(e)}")
+            vectors.update(new_items)
+
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text):
+        """Queries are one-off, so they go straight to the wrapped embedder"""
+        return self.embeddings.embed_query(text)
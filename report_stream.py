@@ -0,0 +1,101 @@
+import logging
+import queue
+import threading
+from langchain_core.callbacks import BaseCallbackHandler
+
+logger = logging.getLogger(__name__)
+
+# CrewAI agents prefix their final output with this marker
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+
+class StreamingEmbedder(BaseCallbackHandler):
+    """Embeds report chunks in the background while the LLM is still streaming the report"""
+
+    def __init__(self, embeddings, split_text, chunk_size):
+        self.embeddings = embeddings
+        self.split_text = split_text
+        self.chunk_size = chunk_size
+        self.active = False
+        self._tails = {}
+        self._answers = {}
+        self._answer_lengths = {}
+        self._queued_lengths = {}
+        self._embedded_chunks = 0
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def start(self):
+        """Begin buffering streamed final answers"""
+        self.active = True
+        logger.info("Streaming report embedding armed")
+
+    def finish(self):
+        """Wait for queued chunks to be embedded and stop the worker"""
+        self._queue.put(None)
+        self._worker.join()
+        if self.active:
+            logger.info(f"Streaming report embedding pre-embedded {self._embedded_chunks} chunks")
+        else:
+            logger.warning("Streaming report embedding was never armed, so the report was not pre-embedded")
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        if not self.active:
+            return
+        parts = self._answers.get(run_id)
+        if parts is None:
+            # Before the marker only keep enough text to spot it when it spans tokens
+            text = self._tails.get(run_id, "") + token
+            index = text.find(FINAL_ANSWER_MARKER)
+            if index == -1:
+                self._tails[run_id] = text[-(len(FINAL_ANSWER_MARKER) - 1):]
+                return
+            self._tails.pop(run_id, None)
+            parts = self._answers[run_id] = [text[index + len(FINAL_ANSWER_MARKER):]]
+            self._answer_lengths[run_id] = len(parts[0])
+        else:
+            parts.append(token)
+            self._answer_lengths[run_id] += len(token)
+        length = self._answer_lengths[run_id]
+        if length - self._queued_lengths.get(run_id, 0) >= self.chunk_size:
+            self._queued_lengths[run_id] = length
+            answer = "".join(parts)
+            parts[:] = [answer]
+            self._queue.put((answer.lstrip(), False))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        parts = self._answers.pop(run_id, None)
+        if parts is not None:
+            self._queue.put(("".join(parts).strip(), True))
+        self._tails.pop(run_id, None)
+        self._answer_lengths.pop(run_id, None)
+        self._queued_lengths.pop(run_id, None)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            # Only the newest snapshot matters, so skip any that piled up behind it
+            done = False
+            while not self._queue.empty():
+                newer = self._queue.get()
+                if newer is None:
+                    done = True
+                    break
+                item = newer
+            text, complete = item
+            chunks = self.split_text(text)
+            if not complete:
+                # The trailing chunk can still grow, so leave it for the next snapshot
+                chunks = chunks[:-1]
+            if chunks:
+                try:
+                    # Already embedded chunks are cache hits, so this only pays for new text
+                    self.embeddings.embed_documents(chunks)
+                    self._embedded_chunks = len(chunks)
+                except Exception as e:
+                    logger.error(f"Error pre-embedding streamed report: {str(e)}")
+            if done:
+                return
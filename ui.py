@@ -1,15 +1,66 @@
 import streamlit as st
-import json
+import functools
+import hashlib
+import orjson
 import re
 import random
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
-import numpy as np
+
+# Patterns used to pull figures and sections out of the analysis text
+_MARKET_SIZE_RE = re.compile(r"\$\s*(\d+(?:\.\d+)?)\s*(million|billion|trillion|M|B|T)", re.IGNORECASE)
+_CAGR_RE = re.compile(r"(?:CAGR|compound annual growth rate|annual growth|growth rate) of (?:approximately |~|about |around )?(\d+(?:\.\d+)?)\s*%", re.IGNORECASE)
+_COMPETITOR_SECTION_RE = re.compile(r"(?:competitors|companies|startups|players|vendors)(?:\s+in|\s+include|\s+are|\:)([^.]*(?:\.[^.]*){0,3})", re.IGNORECASE)
+_COMPANY_RE = re.compile(r'([A-Z][a-zA-Z0-9\'\-]*(?:\s+[A-Z][a-zA-Z0-9\'\-]*)*)')
+_RISK_RE = re.compile(r"(?:key risk|main risk|significant risk|risk factor)s?(?:\s+include|\s+are|\:)([^.]*(?:\.[^.]*){0,3})", re.IGNORECASE)
+_SUCCESS_RE = re.compile(r"(?:success factor|key factor|crucial element|critical aspect)s?(?:\s+include|\s+are|\:)([^.]*(?:\.[^.]*){0,3})", re.IGNORECASE)
+_MODEL_RE = re.compile(r"(?:business model|revenue model|monetization|revenue stream)(?:\s+include|\s+are|\s+should|\s+could|\s+would|\s+recommend|\:)([^.]*(?:\.[^.]*){0,2})", re.IGNORECASE)
+_LIST_SPLIT_RE = re.compile(r'[,;•]+')
+
+_SECTION_HEAD_RE = re.compile(r'#+[ \t]*([^\n#]*)')
+
+# SWOT quadrants that are the same for every topic
+_STRENGTHS_HTML = "<br>".join(f"• {s}" for s in (
+    "First-mover advantage potential",
+    "Low entry barriers for certain segments",
+    "Technological innovation opportunities",
+    "Access to growing customer base"
+))
+_WEAKNESSES_HTML = "<br>".join(f"• {w}" for w in (
+    "Initial capital requirements",
+    "Customer acquisition challenges",
+    "Establishing market credibility",
+    "Talent acquisition competition"
+))
+_THREATS_HTML = "<br>".join(f"• {t}" for t in (
+    "Established competitor presence",
+    "Regulatory evolution uncertainty",
+    "Rapid technological changes",
+    "Economic fluctuations impact"
+))
+
+def _seed(*parts):
+    """Stable seed for the random fallbacks, so the same analysis always gets the same numbers"""
+    return int(hashlib.sha256("|".join(parts).encode()).hexdigest()[:16], 16)
+
+@functools.lru_cache(maxsize=32)
+def _split_sections(text):
+    """Split the report into {heading: section text} in a single pass over the headings"""
+    heads = list(_SECTION_HEAD_RE.finditer(text))
+    sections = {}
+    for i, head in enumerate(heads):
+        end = heads[i + 1].start() if i + 1 < len(heads) else len(text)
+        # Keep the first section when a heading repeats, as re.search would
+        sections.setdefault(head.group(1).strip().upper(), text[head.start():end])
+    return sections
+
+def _find_section(sections, *prefixes):
+    """Return the first section whose heading starts with any of the prefixes, in report order"""
+    for title, section in sections.items():
+        if title.startswith(prefixes):
+            return section
+    return None
 
 # CSS for better styling
-def load_css():
-    st.markdown("""
+_CSS = """
     <style>
         .main-header {font-size: 2.5rem; color: #4527A0; margin-bottom: 0;}
         .sub-header {font-size: 1.2rem; color: #5E35B1; margin-bottom: 2rem;}
@@ -23,22 +74,6 @@ def load_css():
             color: #000000;
             font-weight: 500;
         }
-        .chat-message {
-            padding: 1rem; 
-            border-radius: 0.5rem; 
-            margin-bottom: 0.8rem;
-            font-weight: 500;
-        }
-        .user-message {
-            background-color: #e3f2fd; 
-            border-left: 4px solid #1565C0;
-            color: #000000;
-        }
-        .ai-message {
-            background-color: #f3e5f5; 
-            border-left: 4px solid #6a1b9a;
-            color: #000000;
-        }
         .highlight {
             background-color: #FFE082; 
             padding: 0.2rem; 
@@ -46,6 +81,11 @@ def load_css():
             color: #000000;
         }
         .stProgress > div > div > div > div {background-color: #4527A0;}
+        .metric-grid {
+            display: grid;
+            grid-template-columns: repeat(4, 1fr);
+            gap: 10px;
+        }
         .metric-card {
             background-color: white;
             box-shadow: rgba(0, 0, 0, 0.15) 0px 2px 8px;
@@ -65,7 +105,11 @@ def load_css():
             font-weight: 500;
         }
     </style>
-    """, unsafe_allow_html=True)
+"""
+
+def load_css():
+    # Streamlit drops any element a rerun doesn't emit again, so the style block is sent on every run
+    st.markdown(_CSS, unsafe_allow_html=True)
 
 # Page Configuration
 def setup_page():
@@ -75,15 +119,21 @@ def setup_page():
     st.markdown("<p class='sub-header'>Comprehensive startup insights with advanced market analysis</p>", unsafe_allow_html=True)
 
 # Generate visualizations
+@st.cache_data(ttl=3600, show_spinner=False)
 def generate_visualizations(topic, analysis_text):
     """Generate visualizations based on analysis text and topic"""
+    import numpy as np
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+    
+    rng = np.random.default_rng(_seed(topic, analysis_text))
+    
     # Market size projection
     years = list(range(2023, 2029))
-    base_size = random.randint(5, 20) * 100  # Random starting value between $500M-$2B
+    base_size = int(rng.integers(5, 21)) * 100  # Random starting value between $500M-$2B
     
     # Look for specific market size mentions in the text
-    market_size_pattern = r"\$\s*(\d+(?:\.\d+)?)\s*(million|billion|trillion|M|B|T)"
-    matches = re.findall(market_size_pattern, analysis_text, re.IGNORECASE)
+    matches = _MARKET_SIZE_RE.findall(analysis_text)
     
     if matches:
         # Use the first match as our base
@@ -100,73 +150,63 @@ def generate_visualizations(topic, analysis_text):
             pass  # Fallback to random if conversion fails
     
     # Generate growth pattern
-    cagr_pattern = r"(?:CAGR|compound annual growth rate|annual growth|growth rate) of (?:approximately |~|about |around )?(\d+(?:\.\d+)?)\s*%"
-    cagr_matches = re.findall(cagr_pattern, analysis_text, re.IGNORECASE)
+    cagr_matches = _CAGR_RE.findall(analysis_text)
     
     if cagr_matches:
         try:
             annual_growth = float(cagr_matches[0]) / 100 + 1
         except:
-            annual_growth = random.uniform(1.15, 1.35)  # 15-35% if parsing fails
+            annual_growth = float(rng.uniform(1.15, 1.35))  # 15-35% if parsing fails
     else:
-        annual_growth = random.uniform(1.15, 1.35)  # 15-35% default growth
-    
-    # Generate market sizes with some variability
-    market_sizes = [base_size]
-    for _ in range(len(years)-1):
-        yearly_growth = annual_growth * random.uniform(0.85, 1.15)  # Add variability
-        market_sizes.append(round(market_sizes[-1] * yearly_growth))
-    
-    # Market size chart
-    df_market = pd.DataFrame({
-        'Year': years,
-        'Market Size ($M)': market_sizes
-    })
-    
-    fig_market = px.line(
-        df_market, 
-        x='Year', 
-        y='Market Size ($M)', 
-        title=f'Projected Market Size: {topic}',
-        markers=True
+        annual_growth = float(rng.uniform(1.15, 1.35))  # 15-35% default growth
+    
+    # Generate market sizes with some variability, compounding all years in one vectorized pass
+    yearly_growth = rng.uniform(0.85, 1.15, size=len(years) - 1) * annual_growth
+    market_sizes = np.concatenate(([base_size], base_size * np.cumprod(yearly_growth))).round().astype(int)
+    
+    # Market size chart, built straight from the arrays
+    fig_market = go.Figure(
+        go.Scatter(
+            x=years,
+            y=market_sizes,
+            mode='lines+markers',
+            name='Market Size ($M)'
+        )
     )
     
+    # Annotations for projections, applied together with the layout in one update
+    market_annotations = [
+        dict(
+            x=year,
+            y=market_sizes[i],
+            text="Projected",
+            showarrow=True,
+            arrowhead=1,
+            ax=0,
+            ay=-40,
+            arrowcolor="#4527A0",
+            font=dict(size=10, color="#4527A0")
+        )
+        for i, year in enumerate(years) if year > 2023
+    ]
+    
     fig_market.update_layout(
+        title=f'Projected Market Size: {topic}',
         height=450,
         xaxis_title="Year",
         yaxis_title="Market Size ($M)",
-        hovermode="x unified"
+        hovermode="x unified",
+        annotations=market_annotations
     )
     
-    # Add annotations for projections
-    for i, year in enumerate(years):
-        if year > 2023:
-            fig_market.add_annotation(
-                x=year,
-                y=market_sizes[i],
-                text="Projected",
-                showarrow=True,
-                arrowhead=1,
-                ax=0,
-                ay=-40,
-                arrowcolor="#4527A0",
-                font=dict(size=10, color="#4527A0")
-            )
-    
     # Competitor analysis
-    # Extract competitor mentions if any
-    competitor_pattern = r"(?:competitors|companies|startups|players|vendors)(?:\s+in|\s+include|\s+are|\:)([^.]*(?:\.[^.]*){0,3})"
-    competitor_sections = re.findall(competitor_pattern, analysis_text, re.IGNORECASE)
-    
-    competitors = []
-    if competitor_sections:
-        # Extract company names that might be in the text
-        company_pattern = r'([A-Z][a-zA-Z0-9\'\-]*(?:\s+[A-Z][a-zA-Z0-9\'\-]*)*)'
-        for section in competitor_sections:
-            companies = re.findall(company_pattern, section)
-            for company in companies:
-                if len(company.split()) <= 4 and len(company) > 2:  # Avoid long phrases
-                    competitors.append(company)
+    # Extract company names from competitor mentions in one streaming scan, skipping long phrases
+    competitors = [
+        company
+        for section in _COMPETITOR_SECTION_RE.finditer(analysis_text)
+        for company in (m.group(1) for m in _COMPANY_RE.finditer(section.group(1)))
+        if len(company) > 2 and len(company.split()) <= 4
+    ]
     
     # Ensure we have at least some competitors
     if len(competitors) < 3:
@@ -175,51 +215,37 @@ def generate_visualizations(topic, analysis_text):
         prefixes = ["Tech", "Smart", "AI", "Next", "Future", "Inno", "Digi", "Quantum", "Data", "Cloud"]
         suffixes = ["Solutions", "Technologies", "Systems", "Analytics", "Innovations", "Platforms", "Insights"]
         
-        while len(competitors) < 5:
-            if industry_terms:
-                term = random.choice(industry_terms)
-                prefix = random.choice(prefixes)
-                suffix = random.choice(suffixes)
-                competitor = f"{prefix}{term[:4]}" if len(term) > 4 else f"{prefix}{term}"
-                if random.random() > 0.5:
-                    competitor += f" {suffix}"
-                competitors.append(competitor)
-            else:
-                competitor = f"{random.choice(prefixes)}{random.choice(suffixes)}"
-                competitors.append(competitor)
+        # Draw every missing name at once
+        count = 5 - len(competitors)
+        prefix = rng.choice(prefixes, size=count)
+        suffix = rng.choice(suffixes, size=count)
+        if industry_terms:
+            names = np.char.add(prefix, rng.choice([term[:4] for term in industry_terms], size=count))
+            names = np.where(rng.random(count) > 0.5, np.char.add(np.char.add(names, " "), suffix), names)
+        else:
+            names = np.char.add(prefix, suffix)
+        competitors += names.tolist()
     
     # Keep unique competitors, limit to 7
-    competitors = list(set(competitors))[:7]
-    
-    # Generate random market shares
-    total = 100
-    shares = []
-    for i in range(len(competitors) - 1):
-        if i == 0:
-            # Leader gets bigger share
-            share = random.randint(20, 40)
-        elif i < 3:
-            # Top companies get decent shares
-            share = random.randint(10, 25)
-        else:
-            # Smaller players
-            share = random.randint(5, 15)
-            
-        if share > total:
-            share = total
-            
-        shares.append(share)
-        total -= share
+    competitors = list(dict.fromkeys(competitors))[:7]
     
-    # Last company gets remainder
-    shares.append(total)
+    # Generate random market shares: the leader gets a bigger share, the next two decent shares, the rest smaller
+    rank = np.arange(len(competitors))
+    low = np.select([rank == 0, rank < 3], [20, 10], 5)
+    high = np.select([rank == 0, rank < 3], [40, 25], 15)
+    raw = rng.integers(low, high + 1)
+    
+    # Normalize to 100%, folding the rounding residual into the leader
+    shares = (raw / raw.sum() * 100).round().astype(int)
+    shares[0] += 100 - shares.sum()
     
     # Ensure we don't have any zeros
-    shares = [max(1, share) for share in shares]
+    shares = np.maximum(shares, 1)
     
     # Sort by market share (descending)
-    competitor_data = sorted(zip(competitors, shares), key=lambda x: x[1], reverse=True)
-    competitors, shares = zip(*competitor_data)
+    order = np.argsort(-shares, kind='stable')
+    competitors = [competitors[i] for i in order]
+    shares = shares[order].tolist()
     
     # Competitor market share chart
     fig_competitors = go.Figure(
@@ -227,7 +253,7 @@ def generate_visualizations(topic, analysis_text):
             labels=competitors,
             values=shares,
             hole=.4,
-            marker_colors=px.colors.qualitative.Bold
+            marker_colors=qualitative.Bold
         )
     )
     
@@ -244,40 +270,19 @@ def generate_visualizations(topic, analysis_text):
         )
     )
     
-    # SWOT analysis 
-    strengths = [
-        "First-mover advantage potential",
-        "Low entry barriers for certain segments",
-        "Technological innovation opportunities",
-        "Access to growing customer base"
-    ]
-    
-    weaknesses = [
-        "Initial capital requirements",
-        "Customer acquisition challenges",
-        "Establishing market credibility",
-        "Talent acquisition competition"
-    ]
-    
-    opportunities = [
-        f"Growing {topic} market",
-        "Underserved customer segments",
-        "Integration with existing platforms",
-        "International expansion options"
-    ]
-    
-    threats = [
-        "Established competitor presence",
-        "Regulatory evolution uncertainty",
-        "Rapid technological changes",
-        "Economic fluctuations impact"
-    ]
+    # SWOT analysis: only the opportunities mention the topic, the other quadrants are prebuilt
+    opportunities_html = "<br>".join((
+        f"• Growing {topic} market",
+        "• Underserved customer segments",
+        "• Integration with existing platforms",
+        "• International expansion options"
+    ))
     
     swot_data = {
-        "Strengths": "<br>".join([f"• {s}" for s in strengths]),
-        "Weaknesses": "<br>".join([f"• {w}" for w in weaknesses]),
-        "Opportunities": "<br>".join([f"• {o}" for o in opportunities]),
-        "Threats": "<br>".join([f"• {t}" for t in threats])
+        "Strengths": _STRENGTHS_HTML,
+        "Weaknesses": _WEAKNESSES_HTML,
+        "Opportunities": opportunities_html,
+        "Threats": _THREATS_HTML
     }
     
     fig_swot = go.Figure()
@@ -299,8 +304,8 @@ def generate_visualizations(topic, analysis_text):
         {"name": "Threats", "x": 0.75, "y": 0.25, "color": "#FF9800"}
     ]
     
-    for q in quadrants:
-        fig_swot.add_annotation(
+    swot_annotations = [
+        dict(
             x=q["x"],
             y=q["y"],
             text=f"<b>{q['name']}</b><br><br>{swot_data[q['name']]}",
@@ -313,9 +318,12 @@ def generate_visualizations(topic, analysis_text):
             bgcolor="white",
             opacity=0.8
         )
+        for q in quadrants
+    ]
         
     fig_swot.update_layout(
         title_text="SWOT Analysis for Startup Opportunity",
+        annotations=swot_annotations,
         height=450,
         xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
         yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
@@ -323,34 +331,31 @@ def generate_visualizations(topic, analysis_text):
         margin=dict(l=20, r=20, t=50, b=20)
     )
     
-    return fig_market, fig_competitors, fig_swot, market_sizes[-1], annual_growth - 1
+    return fig_market, fig_competitors, fig_swot, int(market_sizes[-1]), annual_growth - 1
 
 # Extract key insights for dashboard
+@st.cache_data(ttl=3600, show_spinner=False)
 def extract_insights(analysis_text):
     """Extract key metrics and insights from analysis text"""
+    rng = random.Random(_seed(analysis_text))
     
     # Key metrics to extract
     insights = {
-        "timeToMarket": random.randint(6, 18),
-        "initialInvestment": f"${random.randint(50, 500)}K - ${random.randint(500, 2000)}K",
-        "breakEvenEstimate": f"{random.randint(12, 36)} months",
+        "timeToMarket": rng.randint(6, 18),
+        "initialInvestment": f"${rng.randint(50, 500)}K - ${rng.randint(500, 2000)}K",
+        "breakEvenEstimate": f"{rng.randint(12, 36)} months",
         "keyRisks": [],
         "successFactors": [],
         "recommendedBusinessModel": ""
     }
     
-    # Extract key risks
-    risk_pattern = r"(?:key risk|main risk|significant risk|risk factor)s?(?:\s+include|\s+are|\:)([^.]*(?:\.[^.]*){0,3})"
-    risk_sections = re.findall(risk_pattern, analysis_text, re.IGNORECASE)
-    
-    if risk_sections:
-        for section in risk_sections:
-            # Split by commas, semicolons, or bullet points
-            risks = re.split(r'[,;•]+', section)
-            for risk in risks:
-                risk = risk.strip()
-                if 5 < len(risk) < 100 and risk not in insights["keyRisks"]:
-                    insights["keyRisks"].append(risk)
+    # Extract key risks, splitting by commas, semicolons, or bullet points and deduplicating in order
+    insights["keyRisks"] = list(dict.fromkeys(
+        risk.strip()
+        for section in _RISK_RE.findall(analysis_text)
+        for risk in _LIST_SPLIT_RE.split(section)
+        if 5 < len(risk.strip()) < 100
+    ))
     
     # Fallback for risks
     if not insights["keyRisks"]:
@@ -361,18 +366,13 @@ def extract_insights(analysis_text):
             "Initial customer acquisition costs"
         ]
     
-    # Extract success factors
-    success_pattern = r"(?:success factor|key factor|crucial element|critical aspect)s?(?:\s+include|\s+are|\:)([^.]*(?:\.[^.]*){0,3})"
-    success_sections = re.findall(success_pattern, analysis_text, re.IGNORECASE)
-    
-    if success_sections:
-        for section in success_sections:
-            # Split by commas, semicolons, or bullet points
-            factors = re.split(r'[,;•]+', section)
-            for factor in factors:
-                factor = factor.strip()
-                if 5 < len(factor) < 100 and factor not in insights["successFactors"]:
-                    insights["successFactors"].append(factor)
+    # Extract success factors the same way
+    insights["successFactors"] = list(dict.fromkeys(
+        factor.strip()
+        for section in _SUCCESS_RE.findall(analysis_text)
+        for factor in _LIST_SPLIT_RE.split(section)
+        if 5 < len(factor.strip()) < 100
+    ))
     
     # Fallback for success factors
     if not insights["successFactors"]:
@@ -384,8 +384,7 @@ def extract_insights(analysis_text):
         ]
     
     # Extract business model
-    model_pattern = r"(?:business model|revenue model|monetization|revenue stream)(?:\s+include|\s+are|\s+should|\s+could|\s+would|\s+recommend|\:)([^.]*(?:\.[^.]*){0,2})"
-    model_sections = re.findall(model_pattern, analysis_text, re.IGNORECASE)
+    model_sections = _MODEL_RE.findall(analysis_text)
     
     if model_sections:
         # Use the longest match as it likely has more information
@@ -398,7 +397,7 @@ def extract_insights(analysis_text):
             "Transaction-based revenue model with fee per transaction",
             "Marketplace model connecting providers and consumers with commission structure"
         ]
-        insights["recommendedBusinessModel"] = random.choice(models)
+        insights["recommendedBusinessModel"] = rng.choice(models)
     
     return insights
 
@@ -416,35 +415,70 @@ def display_qa_interface(topic, ask_question_func):
     if topic not in st.session_state.chat_history:
         st.session_state.chat_history[topic] = []
     
-    # Display chat history
-    for message in st.session_state.chat_history[topic]:
-        if message["role"] == "user":
-            st.markdown(f"<div class='chat-message user-message'><strong style='color:#1565C0;'>You:</strong> {message['content']}</div>", unsafe_allow_html=True)
-        else:
-            st.markdown(f"<div class='chat-message ai-message'><strong style='color:#6a1b9a;'>AI:</strong> {message['content']}</div>", unsafe_allow_html=True)
+    _qa_panel(topic, ask_question_func)
+
+# Q&A chat panel
+def _qa_panel(topic, ask_question_func):
+    """Chat history, suggestions and question input; reruns on its own where fragments are supported"""
+    # Display chat history; new turns are rendered into the same container in place
+    chat_container = st.container()
+    with chat_container:
+        for message in st.session_state.chat_history[topic]:
+            # Only answers carry the highlighted risk spans; questions render as plain markdown, as when first asked
+            with st.chat_message(message["role"]):
+                st.markdown(message["content"], unsafe_allow_html=message["role"] == "assistant")
     
     # Suggestion buttons for common questions
+    question = None
     col1, col2, col3 = st.columns(3)
     with col1:
         if st.button("💰 Initial investment needed?"):
             question = f"What is the recommended initial investment for a {topic} startup?"
-            ask_question_func(question, topic)
             
     with col2:
         if st.button("🏆 Key success factors?"):
             question = f"What are the key success factors for a {topic} startup?"
-            ask_question_func(question, topic)
             
     with col3:
         if st.button("⚠️ Main risks to consider?"):
             question = f"What are the main risks and challenges for a {topic} startup?"
-            ask_question_func(question, topic)
     
     # Custom question input
-    question = st.text_input("Ask a specific question:", key="qa_input")
-    if st.button("Ask Question") and question:
-        ask_question_func(question, topic)
+    custom_question = st.text_input("Ask a specific question:", key="qa_input")
+    if st.button("Ask Question") and custom_question:
+        question = custom_question
+    
+    if question:
+        with chat_container:
+            ask_question_func(question, topic)
+
+# Fragments need Streamlit 1.33+ (1.37+ for the stable name); older versions run the panel as part of the full script
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+if _fragment is not None:
+    _qa_panel = _fragment(_qa_panel)
         
+# Serialize the full analysis for the JSON download
+@st.cache_data(show_spinner=False)
+def _build_json_blob(topic, analysis_text, insights, projected_market_size, growth_rate):
+    """Build the JSON download once per report instead of on every rerun"""
+    analysis_data = {
+        "topic": topic,
+        "analysis": analysis_text,
+        "marketMetrics": {
+            "projectedSize": projected_market_size,
+            "cagr": round(growth_rate*100, 1),
+            "timeToMarket": insights['timeToMarket'],
+            "breakEven": insights['breakEvenEstimate']
+        },
+        "businessInsights": {
+            "initialInvestment": insights['initialInvestment'],
+            "recommendedModel": insights['recommendedBusinessModel'],
+            "keyRisks": insights['keyRisks'],
+            "successFactors": insights['successFactors']
+        }
+    }
+    return orjson.dumps(analysis_data, option=orjson.OPT_INDENT_2)
+
 # Display startup analysis dashboard
 def display_analysis_dashboard(analysis_text, topic):
     """Display comprehensive startup analysis dashboard"""
@@ -452,29 +486,47 @@ def display_analysis_dashboard(analysis_text, topic):
         st.error("No analysis data available.")
         return
     
-    # Generate visualizations
-    fig_market, fig_competitors, fig_swot, projected_market_size, growth_rate = generate_visualizations(topic, analysis_text)
+    # Generate visualizations and extract key insights, keeping the figures and insights in session
+    # state so reruns with the same report (e.g. Q&A clicks) skip both steps. The figures stay as
+    # go.Figure objects: st.plotly_chart rebuilds and validates a Figure from dict specs
+    text_hash = hash(analysis_text)
+    dash_key = f"dash_{topic}"
+    cached = st.session_state.get(dash_key)
+    if cached is None or cached["hash"] != text_hash:
+        fig_market, fig_competitors, fig_swot, projected_market_size, growth_rate = generate_visualizations(topic, analysis_text)
+        insights = extract_insights(analysis_text)
+        cached = {
+            "hash": text_hash,
+            "data": (fig_market, fig_competitors, fig_swot, projected_market_size, growth_rate, insights)
+        }
+        st.session_state[dash_key] = cached
+    fig_market, fig_competitors, fig_swot, projected_market_size, growth_rate, insights = cached["data"]
+    
+    # Build all HTML before rendering, so the dashboard below is emitted strictly top to bottom
+    # All four metric cards go out as one element laid out by a CSS grid
+    metrics = [
+        (f"${projected_market_size}M", "Projected Market (2028)"),
+        (f"{round(growth_rate*100, 1)}%", "CAGR"),
+        (insights['timeToMarket'], "Months to Market"),
+        (insights['breakEvenEstimate'], "Est. Break-even")
+    ]
+    cards_html = "".join(
+        f"<div class='metric-card'><div class='metric-value'>{value}</div><div class='metric-label'>{label}</div></div>"
+        for value, label in metrics
+    )
     
-    # Extract key insights
-    insights = extract_insights(analysis_text)
+    risks_html = (
+        "<div class='insight-card' style='background-color: #ffebee; border-left-color: #e53935;'>"
+        + "<br>".join(f"• {risk}" for risk in insights['keyRisks'][:3])  # Show top 3 risks
+        + "</div>"
+    )
     
     # Display dashboard layout
     st.markdown(f"<h2 class='section-header'>Startup Analysis: {topic}</h2>", unsafe_allow_html=True)
     
     # Market metrics section
     st.markdown("<h3 class='section-header'>📊 Market Metrics</h3>", unsafe_allow_html=True)
-    
-    metric_cols = st.columns(4)
-    with metric_cols[0]:
-        st.markdown(
-            f"""
-            <div class="metric-card">
-                <div class="metric-value">${projected_market_size}M</div>
-                <div class="metric-label">Projected Market (2028)</div>
-            </div>
-            """, 
-            unsafe_allow_html=True
-        )
+    st.markdown(f"<div class='metric-grid'>{cards_html}</div>", unsafe_allow_html=True)
     
     # Charts section
     chart_cols = st.columns([1, 1])
@@ -498,10 +550,6 @@ def display_analysis_dashboard(analysis_text, topic):
         st.markdown(f"<div class='insight-card'>{insights['recommendedBusinessModel']}</div>", unsafe_allow_html=True)
         
         st.markdown("<h4>⚠️ Key Risks</h4>", unsafe_allow_html=True)
-        risks_html = "<div class='insight-card' style='background-color: #ffebee; border-left-color: #e53935;'>"
-        for risk in insights['keyRisks'][:3]:  # Show top 3 risks
-            risks_html += f"• {risk}<br>"
-        risks_html += "</div>"
         st.markdown(risks_html, unsafe_allow_html=True)
     
     # Full report tabs
@@ -515,57 +563,30 @@ def display_analysis_dashboard(analysis_text, topic):
         "Full Report"
     ])
     
-    # Extract sections using regex patterns
-    market_pattern = r'(?:#+ *MARKET ANALYSIS.*?)(?=#+ *|$)'
-    competitive_pattern = r'(?:#+ *COMPETITIVE LANDSCAPE.*?)(?=#+ *|$)'
-    business_pattern = r'(?:#+ *BUSINESS STRATEGY.*?)(?=#+ *|$)'
-    financial_pattern = r'(?:#+ *FINANCIAL CONSIDERATIONS.*?)(?=#+ *|$)'
+    sections = _split_sections(analysis_text)
     
     with tabs[0]:
-        market_section = re.search(market_pattern, analysis_text, re.DOTALL | re.IGNORECASE)
+        market_section = _find_section(sections, "MARKET ANALYSIS")
         if market_section:
-            st.markdown(market_section.group(0))
+            st.markdown(market_section)
         else:
             st.markdown(analysis_text[:int(len(analysis_text)/5)])  # Show first fifth if no section found
     
     with tabs[1]:
-        competitive_section = re.search(competitive_pattern, analysis_text, re.DOTALL | re.IGNORECASE)
-        if competitive_section:
-            st.markdown(competitive_section.group(0))
-        else:
-            # Try alternative headings
-            alt_pattern = r'(?:#+ *COMPETITORS.*?)(?=#+ *|$)|(?:#+ *COMPETITION.*?)(?=#+ *|$)'
-            alt_section = re.search(alt_pattern, analysis_text, re.DOTALL | re.IGNORECASE)
-            if alt_section:
-                st.markdown(alt_section.group(0))
-            else:
-                st.markdown("Competitive landscape analysis not found in structured format.")
+        # Fall back to alternative headings
+        competitive_section = (_find_section(sections, "COMPETITIVE LANDSCAPE")
+                               or _find_section(sections, "COMPETITORS", "COMPETITION"))
+        st.markdown(competitive_section or "Competitive landscape analysis not found in structured format.")
     
     with tabs[2]:
-        business_section = re.search(business_pattern, analysis_text, re.DOTALL | re.IGNORECASE)
-        if business_section:
-            st.markdown(business_section.group(0))
-        else:
-            # Try alternative headings
-            alt_pattern = r'(?:#+ *STRATEGY.*?)(?=#+ *|$)|(?:#+ *RECOMMENDATIONS.*?)(?=#+ *|$)'
-            alt_section = re.search(alt_pattern, analysis_text, re.DOTALL | re.IGNORECASE)
-            if alt_section:
-                st.markdown(alt_section.group(0))
-            else:
-                st.markdown("Business strategy section not found in structured format.")
+        business_section = (_find_section(sections, "BUSINESS STRATEGY")
+                            or _find_section(sections, "STRATEGY", "RECOMMENDATIONS"))
+        st.markdown(business_section or "Business strategy section not found in structured format.")
     
     with tabs[3]:
-        financial_section = re.search(financial_pattern, analysis_text, re.DOTALL | re.IGNORECASE)
-        if financial_section:
-            st.markdown(financial_section.group(0))
-        else:
-            # Try alternative headings
-            alt_pattern = r'(?:#+ *FINANCIAL.*?)(?=#+ *|$)|(?:#+ *INVESTMENT.*?)(?=#+ *|$)'
-            alt_section = re.search(alt_pattern, analysis_text, re.DOTALL | re.IGNORECASE)
-            if alt_section:
-                st.markdown(alt_section.group(0))
-            else:
-                st.markdown("Financial insights section not found in structured format.")
+        financial_section = (_find_section(sections, "FINANCIAL CONSIDERATIONS")
+                             or _find_section(sections, "FINANCIAL", "INVESTMENT"))
+        st.markdown(financial_section or "Financial insights section not found in structured format.")
     
     with tabs[4]:
         st.markdown(analysis_text)
@@ -581,60 +602,9 @@ def display_analysis_dashboard(analysis_text, topic):
             )
         
         with col2:
-            # Create JSON with all analysis data
-            analysis_data = {
-                "topic": topic,
-                "analysis": analysis_text,
-                "marketMetrics": {
-                    "projectedSize": projected_market_size,
-                    "cagr": round(growth_rate*100, 1),
-                    "timeToMarket": insights['timeToMarket'],
-                    "breakEven": insights['breakEvenEstimate']
-                },
-                "businessInsights": {
-                    "initialInvestment": insights['initialInvestment'],
-                    "recommendedModel": insights['recommendedBusinessModel'],
-                    "keyRisks": insights['keyRisks'],
-                    "successFactors": insights['successFactors']
-                }
-            }
-            
             st.download_button(
                 "Download as JSON",
-                data=json.dumps(analysis_data, indent=2),
+                data=_build_json_blob(topic, analysis_text, insights, projected_market_size, growth_rate),
                 file_name=f"{topic.replace(' ', '_')}_analysis.json",
                 mime="application/json"
             )
-    
-    with metric_cols[1]:
-        st.markdown(
-            f"""
-            <div class="metric-card">
-                <div class="metric-value">{round(growth_rate*100, 1)}%</div>
-                <div class="metric-label">CAGR</div>
-            </div>
-            """, 
-            unsafe_allow_html=True
-        )
-        
-    with metric_cols[2]:
-        st.markdown(
-            f"""
-            <div class="metric-card">
-                <div class="metric-value">{insights['timeToMarket']}</div>
-                <div class="metric-label">Months to Market</div>
-            </div>
-            """, 
-            unsafe_allow_html=True
-        )
-        
-    with metric_cols[3]:
-        st.markdown(
-            f"""
-            <div class="metric-card">
-                <div class="metric-value">{insights['breakEvenEstimate']}</div>
-                <div class="metric-label">Est. Break-even</div>
-            </div>
-            """, 
-            unsafe_allow_html=True
-        )
\ No newline at end of file